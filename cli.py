@@ -9,15 +9,40 @@ This provides a user-friendly command-line interface for:
 
 import asyncio
 import argparse
+import fcntl
+import hashlib
+import json
 import sys
 import os
+import time
+from collections import Counter
 from pathlib import Path
+import aiofiles
+from tqdm.asyncio import tqdm as atqdm
 from github_agent_workflow import GitHubAgentWorkflow
 from colorama import init, Fore, Style
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to stdlib json
+
+
+def dumps_json(obj) -> bytes:
+    """Serialize obj to bytes, preferring orjson's C encoder when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+# On-disk cache of processed repositories, so repeat runs against the same
+# URL skip the GitHub fetch and LLM summarization entirely
+CACHE_DIR = os.path.expanduser('~/.cache/gh_agent')
+CACHE_INDEX = os.path.join(CACHE_DIR, 'index.json')
+CACHE_TTL = 3600  # seconds
+
 
 class InteractiveCLI:
     """Interactive command-line interface"""
@@ -25,7 +50,68 @@ class InteractiveCLI:
     def __init__(self, gemini_api_key: str, github_token: str = None):
         self.workflow = GitHubAgentWorkflow(gemini_api_key, github_token)
         self.current_repo = None
+        self._qa_counter = 0
+
+    def _seed_qa_counter(self):
+        """Count existing Q&A files once so each save doesn't rescan the directory"""
+        qa_dir = os.path.dirname(self.workflow.summary_path)
+        try:
+            self._qa_counter = sum(
+                1 for entry in os.scandir(qa_dir)
+                if entry.name.startswith('qa_') and entry.name.endswith('.txt')
+            )
+        except FileNotFoundError:
+            self._qa_counter = 0
+
+    def _cache_lookup(self, repo_url: str):
+        """Return the cached summary path for repo_url if it's still fresh, else None"""
+        try:
+            with open(CACHE_INDEX, 'rb') as f:
+                raw = f.read()
+            index = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        entry = index.get(hashlib.sha256(repo_url.encode()).hexdigest())
+        if not entry:
+            return None
+        if time.time() - entry.get('ts', 0) > CACHE_TTL:
+            return None
+        if not os.path.exists(entry['path']):
+            return None
+        return entry['path']
+
+    def _cache_store(self, repo_url: str, summary_path: str):
+        """Record repo_url -> summary_path in the cache index (flock-protected)"""
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(CACHE_INDEX, 'a+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    index = (orjson.loads(raw) if orjson is not None else json.loads(raw)) if raw else {}
+                except ValueError:
+                    index = {}
+
+                index[hashlib.sha256(repo_url.encode()).hexdigest()] = {
+                    'path': summary_path,
+                    'ts': time.time()
+                }
+
+                f.seek(0)
+                f.truncate()
+                if orjson is not None:
+                    f.write(orjson.dumps(index))
+                else:
+                    f.write(json.dumps(index).encode('utf-8'))
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
     
+    async def _ainput(self, prompt: str) -> str:
+        """Prompt for input without blocking the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
+
     def print_banner(self):
         """Print welcome banner"""
         print(f"\n{Fore.CYAN}{'='*80}")
@@ -44,32 +130,53 @@ class InteractiveCLI:
     
     async def process_repo_interactive(self):
         """Interactive repository processing"""
-        repo_url = input(f"{Fore.CYAN}Enter GitHub repository URL: {Style.RESET_ALL}").strip()
+        repo_url = (await self._ainput(f"{Fore.CYAN}Enter GitHub repository URL: {Style.RESET_ALL}")).strip()
         
         if not repo_url:
             print(f"{Fore.RED}❌ Invalid URL{Style.RESET_ALL}")
             return
         
+        # Reuse a recent summary for this URL instead of re-processing
+        cached_path = self._cache_lookup(repo_url)
+        if cached_path:
+            try:
+                await asyncio.to_thread(self.workflow.load_existing_summary, cached_path)
+                self.current_repo = repo_url
+                self._seed_qa_counter()
+                print(f"{Fore.GREEN}✅ Loaded cached summary: {cached_path}{Style.RESET_ALL}")
+                return
+            except Exception:
+                pass  # Stale/corrupt cache entry; fall through to a full run
+
         print(f"\n{Fore.YELLOW}⏳ Processing repository... This may take a few minutes.{Style.RESET_ALL}\n")
-        
+
         try:
             summary_path = await self.workflow.process_repository(repo_url)
             self.current_repo = repo_url
+            self._seed_qa_counter()
+            self._cache_store(repo_url, summary_path)
             print(f"\n{Fore.GREEN}✅ Repository processed successfully!{Style.RESET_ALL}")
             print(f"{Fore.CYAN}Summary saved to: {summary_path}{Style.RESET_ALL}")
         except Exception as e:
             print(f"\n{Fore.RED}❌ Error processing repository: {e}{Style.RESET_ALL}")
     
-    def load_summary_interactive(self):
+    async def load_summary_interactive(self):
         """Interactive summary loading"""
-        summary_path = input(f"{Fore.CYAN}Enter path to summary file: {Style.RESET_ALL}").strip()
+        summary_path = (await self._ainput(f"{Fore.CYAN}Enter path to summary file: {Style.RESET_ALL}")).strip()
         
-        if not os.path.exists(summary_path):
+        # One stat covers both the existence check and a size hint for the
+        # loader, avoiding a second metadata roundtrip
+        try:
+            st = os.stat(summary_path)
+        except FileNotFoundError:
             print(f"{Fore.RED}❌ File not found{Style.RESET_ALL}")
             return
-        
+
         try:
-            self.workflow.load_existing_summary(summary_path)
+            await asyncio.to_thread(
+                self.workflow.load_existing_summary, summary_path, size_hint=st.st_size
+            )
+            self._seed_qa_counter()
             print(f"{Fore.GREEN}✅ Summary loaded successfully!{Style.RESET_ALL}")
         except Exception as e:
             print(f"{Fore.RED}❌ Error loading summary: {e}{Style.RESET_ALL}")
@@ -85,7 +192,7 @@ class InteractiveCLI:
         print(f"  - Ask about implementation details, architecture, or usage")
         print(f"  - Mention specific features or components if known\n")
         
-        question = input(f"{Fore.CYAN}Your question: {Style.RESET_ALL}").strip()
+        question = (await self._ainput(f"{Fore.CYAN}Your question: {Style.RESET_ALL}")).strip()
         
         if not question:
             print(f"{Fore.RED}❌ Please enter a question{Style.RESET_ALL}")
@@ -93,7 +200,7 @@ class InteractiveCLI:
         
         try:
             # Ask about number of files to analyze
-            top_k_input = input(f"{Fore.CYAN}How many files to analyze? (default: 10): {Style.RESET_ALL}").strip()
+            top_k_input = (await self._ainput(f"{Fore.CYAN}How many files to analyze? (default: 10): {Style.RESET_ALL}")).strip()
             top_k = int(top_k_input) if top_k_input else 10
             
             result = await self.workflow.ask_question(question, top_k=top_k)
@@ -101,47 +208,50 @@ class InteractiveCLI:
             # Save individual Q&A
             if self.workflow.summary_path:
                 qa_dir = os.path.dirname(self.workflow.summary_path)
-                qa_file = os.path.join(qa_dir, f"qa_{len(os.listdir(qa_dir))}.txt")
-                
-                with open(qa_file, 'w', encoding='utf-8') as f:
-                    f.write(f"Question: {result['question']}\n\n")
-                    f.write(f"Selected Files:\n")
-                    for path in result['selected_files']:
-                        f.write(f"  - {path}\n")
-                    f.write(f"\nAnswer:\n{result['answer']}\n")
+                qa_file = os.path.join(qa_dir, f"qa_{self._qa_counter}.txt")
+                self._qa_counter += 1
                 
+                # Assemble the payload once and issue a single write
+                body = (
+                    f"Question: {result['question']}\n\n"
+                    "Selected Files:\n"
+                    + "".join(f"  - {path}\n" for path in result['selected_files'])
+                    + f"\nAnswer:\n{result['answer']}\n"
+                )
+                async with aiofiles.open(qa_file, 'w', encoding='utf-8') as f:
+                    await f.write(body)
+
                 print(f"\n{Fore.CYAN}💾 Q&A saved to: {qa_file}{Style.RESET_ALL}")
         
         except Exception as e:
             print(f"\n{Fore.RED}❌ Error answering question: {e}{Style.RESET_ALL}")
     
+    # Precomputed escape strings so the hot stats loop doesn't go through
+    # colorama's per-print ANSI re-parsing
+    _STATS_HEADER = f"\n{Fore.CYAN}📊 Repository Statistics{Style.RESET_ALL}\n{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n"
+    _LANG_HEADER = f"\n{Fore.YELLOW}Files by Language:{Style.RESET_ALL}\n"
+
     def show_stats(self):
         """Show repository statistics"""
         if self.workflow.summaries is None:
             print(f"{Fore.RED}❌ No repository loaded{Style.RESET_ALL}")
             return
-        
-        print(f"\n{Fore.CYAN}📊 Repository Statistics{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
-        
+
         # Count by language
-        lang_count = {}
-        for summary in self.workflow.summaries:
-            lang = summary.language or "Unknown"
-            lang_count[lang] = lang_count.get(lang, 0) + 1
-        
-        print(f"\n{Fore.YELLOW}Files by Language:{Style.RESET_ALL}")
-        for lang, count in sorted(lang_count.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {lang}: {count}")
-        
-        print(f"\n{Fore.YELLOW}Total Files:{Style.RESET_ALL} {len(self.workflow.summaries)}")
-        
+        lang_count = Counter(s.language or "Unknown" for s in self.workflow.summaries)
+
+        # Batch the whole dump into one stdout write instead of a print per line
+        buf = [self._STATS_HEADER, self._LANG_HEADER]
+        buf.extend(f"  {lang}: {count}\n" for lang, count in lang_count.most_common())
+        buf.append(f"\n{Fore.YELLOW}Total Files:{Style.RESET_ALL} {len(self.workflow.summaries)}\n")
+
         if self.workflow.repo_data:
             metadata = self.workflow.repo_data['metadata']
-            print(f"{Fore.YELLOW}Total Size:{Style.RESET_ALL} {metadata['total_size'] / 1024:.2f} KB")
-            print(f"{Fore.YELLOW}Processing Time:{Style.RESET_ALL} {metadata['processing_time']:.2f}s")
-        
-        print()
+            buf.append(f"{Fore.YELLOW}Total Size:{Style.RESET_ALL} {metadata['total_size'] / 1024:.2f} KB\n")
+            buf.append(f"{Fore.YELLOW}Processing Time:{Style.RESET_ALL} {metadata['processing_time']:.2f}s\n")
+
+        buf.append("\n")
+        sys.stdout.write("".join(buf))
     
     async def run(self):
         """Main interactive loop"""
@@ -149,12 +259,12 @@ class InteractiveCLI:
         
         while True:
             self.print_menu()
-            choice = input(f"{Fore.CYAN}Select an option (1-5): {Style.RESET_ALL}").strip()
-            
+            choice = (await self._ainput(f"{Fore.CYAN}Select an option (1-5): {Style.RESET_ALL}")).strip()
+
             if choice == '1':
                 await self.process_repo_interactive()
             elif choice == '2':
-                self.load_summary_interactive()
+                await self.load_summary_interactive()
             elif choice == '3':
                 await self.ask_question_interactive()
             elif choice == '4':
@@ -175,31 +285,58 @@ async def batch_mode(args):
         print(f"{Fore.YELLOW}Processing repository...{Style.RESET_ALL}")
         summary_path = await workflow.process_repository(args.repo_url, args.output_dir)
     elif args.summary_file:
-        workflow.load_existing_summary(args.summary_file)
+        await asyncio.to_thread(workflow.load_existing_summary, args.summary_file)
     else:
         print(f"{Fore.RED}❌ Please provide either --repo-url or --summary-file{Style.RESET_ALL}")
         return
     
     # Answer questions from file
     if args.questions_file:
-        with open(args.questions_file, 'r') as f:
-            questions = [line.strip() for line in f if line.strip()]
-        
-        results = []
-        for i, question in enumerate(questions, 1):
-            print(f"\n{Fore.CYAN}Question {i}/{len(questions)}{Style.RESET_ALL}")
-            result = await workflow.ask_question(question, top_k=args.top_k)
-            results.append(result)
-        
+        # Read the whole file once and decode a single time; per-line text-mode
+        # iteration pays a utf-8 decode and Python loop step for every line
+        with open(args.questions_file, 'rb') as f:
+            raw = f.read()
+        questions = [q for q in (line.strip() for line in raw.decode('utf-8').splitlines()) if q]
+
+        # Answer questions concurrently, capped by a semaphore so we don't
+        # flood the Gemini API; gather preserves input order
+        sem = asyncio.Semaphore(args.concurrency)
+
+        async def _one(question):
+            async with sem:
+                try:
+                    return await workflow.ask_question(question, top_k=args.top_k)
+                except Exception as e:
+                    return {'question': question, 'error': str(e)}
+
+        # tqdm's gather coalesces progress into a rate-limited redraw with an
+        # ETA instead of one print per question
+        results = await atqdm.gather(
+            *[_one(question) for question in questions],
+            total=len(questions),
+            desc="Questions"
+        )
+
+        errors = sum(1 for r in results if 'error' in r)
+        print(f"\n{Fore.CYAN}Answered {len(questions) - errors}/{len(questions)} questions{Style.RESET_ALL}")
+
         # Save results
-        import json
         output_file = os.path.join(args.output_dir, "batch_results.json")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        
+        async with aiofiles.open(output_file, 'wb') as f:
+            await f.write(dumps_json(results))
+
         print(f"\n{Fore.GREEN}✅ Results saved to: {output_file}{Style.RESET_ALL}")
 
 
+async def amain(args):
+    """Async entry point; hosts with a running loop can drive this directly"""
+    if args.batch or args.questions_file:
+        await batch_mode(args)
+    else:
+        cli = InteractiveCLI(args.api_key, args.github_token)
+        await cli.run()
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -218,31 +355,33 @@ Examples:
         """
     )
     
-    parser.add_argument('--api-key', help='Gemini API key (or set GEMINI_API_KEY env var)')
-    parser.add_argument('--github-token', help='GitHub token (optional, or set GITHUB_TOKEN env var)')
+    parser.add_argument('--api-key', default=os.environ.get('GEMINI_API_KEY'),
+                        help='Gemini API key (or set GEMINI_API_KEY env var)')
+    parser.add_argument('--github-token', default=os.environ.get('GITHUB_TOKEN'),
+                        help='GitHub token (optional, or set GITHUB_TOKEN env var)')
     parser.add_argument('--repo-url', help='GitHub repository URL to process')
     parser.add_argument('--summary-file', help='Path to existing summary file')
     parser.add_argument('--questions-file', help='File containing questions (one per line)')
     parser.add_argument('--output-dir', default='./repo_analysis', help='Output directory')
     parser.add_argument('--top-k', type=int, default=10, help='Number of files to analyze per question')
+    parser.add_argument('--concurrency', type=int, default=5, help='Max questions answered in parallel (batch mode)')
     parser.add_argument('--batch', action='store_true', help='Run in batch mode (non-interactive)')
     
     args = parser.parse_args()
     
-    # Get API key from args or environment
-    api_key = args.api_key or os.getenv('GEMINI_API_KEY')
-    if not api_key:
+    if not args.api_key:
         print(f"{Fore.RED}❌ Please provide Gemini API key via --api-key or GEMINI_API_KEY env var{Style.RESET_ALL}")
         sys.exit(1)
-    
-    github_token = args.github_token or os.getenv('GITHUB_TOKEN')
-    
-    # Run appropriate mode
-    if args.batch or args.questions_file:
-        asyncio.run(batch_mode(args))
+
+    # Reuse an already-running loop (e.g. when driven from a REPL or wrapper
+    # daemon) so connection pools and resolver threads survive across calls;
+    # otherwise fall back to a one-shot asyncio.run
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(amain(args))
     else:
-        cli = InteractiveCLI(api_key, github_token)
-        asyncio.run(cli.run())
+        loop.create_task(amain(args))
 
 
 if __name__ == "__main__":
@@ -77,12 +77,17 @@ async def analyze_repository():
         print(f"{result['answer']}\n")
     
     # Example 3: Save all Q&A results
-    import json
     qa_output_path = "./my_analysis/qa_results.json"
-    
-    with open(qa_output_path, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, indent=2, ensure_ascii=False)
-    
+
+    try:
+        import orjson
+        with open(qa_output_path, 'wb') as f:
+            f.write(orjson.dumps(all_results, option=orjson.OPT_INDENT_2))
+    except ImportError:
+        import json
+        with open(qa_output_path, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, indent=2, ensure_ascii=False)
+
     print(f"\n✅ All Q&A results saved to: {qa_output_path}")
     
     # Example 4: Demonstrate loading existing summary
@@ -96,8 +101,8 @@ async def analyze_repository():
         github_token=GITHUB_TOKEN
     )
     
-    # Load the summary we just created
-    workflow2.load_existing_summary(summary_path)
+    # Load the summary we just created (off the event loop; the read blocks)
+    await asyncio.to_thread(workflow2.load_existing_summary, summary_path)
     
     # Ask a new question using the loaded summary
     new_question = "How does FastAPI achieve high performance?"
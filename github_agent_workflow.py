@@ -15,16 +15,88 @@ Features:
 """
 
 import os
+import ast
 import json
+import re
 import asyncio
+import hashlib
+import io
+import math
+import sqlite3
+import tarfile
+import aiofiles
 import aiohttp
+import zstandard as zstd
+from aiolimiter import AsyncLimiter
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+from google.api_core import exceptions as gapi_exceptions
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
 import base64
 from pathlib import Path
 import google.generativeai as genai
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data):
+    """Parse JSON with orjson when available, stdlib json otherwise"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """Serialize to compact JSON with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
+
+# Fetched file contents stay resident for the whole session (ask_question
+# needs them later), so they are zstd-compressed in place right after fetch
+# and decompressed on demand; source text typically shrinks 3-5x
+_ZSTD_COMPRESSOR = zstd.ZstdCompressor(level=3)
+_ZSTD_DECOMPRESSOR = zstd.ZstdDecompressor()
+
+
+def _compress_content(file_data: Dict) -> Dict:
+    """Compress a fetched file's content in place and flag it"""
+    if not file_data.get('compressed'):
+        file_data['content'] = _ZSTD_COMPRESSOR.compress(file_data['content'].encode())
+        file_data['compressed'] = True
+    return file_data
+
+
+def _content(file_data: Dict) -> str:
+    """Return a file's text content, decompressing on demand"""
+    if file_data.get('compressed'):
+        return _ZSTD_DECOMPRESSOR.decompress(file_data['content']).decode(
+            'utf-8', errors='ignore'
+        )
+    return file_data['content']
+
+
+def _write_json_atomic(path: str, obj) -> None:
+    """Write JSON to a temp file and atomically rename it into place
+
+    Blocking by design; run it via asyncio.to_thread from async code so a
+    large dump doesn't stall the event loop.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    if orjson is not None:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
 
 @dataclass
 class FileSummary:
@@ -52,9 +124,215 @@ class RepoMetadata:
     timestamp: str
 
 
+# Bump whenever the summarization prompt changes so cached entries invalidate
+PROMPT_VERSION = '1'
+
+# Gemini sometimes wraps JSON in a markdown fence despite instructions; one
+# compiled pattern covers the variants (```json, bare ```, trailing space)
+# the old startswith/endswith chain missed
+_JSON_FENCE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+# Ask the SDK for raw JSON so fenced responses mostly disappear at the source
+JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+
+def extract_json(text: str) -> str:
+    """Strip a surrounding markdown code fence from an LLM response, if any"""
+    match = _JSON_FENCE.match(text)
+    return match.group(1) if match else text.strip()
+
+
+# Prompt-budget knobs: runs of non-whitespace this long are minified/base64
+# noise, and token counts are approximated at ~4 chars/token for code so no
+# count_tokens API round-trip is needed
+_LONG_RUN = re.compile(r'\S{200,}')
+_COMMENT_LINE = re.compile(r'^\s*(?://|#)')
+CHARS_PER_TOKEN = 4
+SUMMARY_CONTENT_TOKENS = 8000
+ANSWER_CONTENT_TOKENS = 1500
+MAX_COMMENT_LINES = 200
+
+
+def sanitize_content(text: str) -> str:
+    """Strip content that eats prompt tokens without informing the model
+
+    Collapses minified/base64-style runs, caps comment floods in very
+    comment-heavy files, and trims trailing whitespace.
+    """
+    text = _LONG_RUN.sub(lambda m: f'[...omitted {len(m.group())} chars...]', text)
+
+    lines = text.splitlines()
+    comment_count = sum(1 for line in lines if _COMMENT_LINE.match(line))
+    if comment_count > MAX_COMMENT_LINES and comment_count > len(lines) // 2:
+        kept, seen = [], 0
+        for line in lines:
+            if _COMMENT_LINE.match(line):
+                seen += 1
+                if seen > MAX_COMMENT_LINES:
+                    continue
+            kept.append(line)
+        lines = kept
+
+    return '\n'.join(line.rstrip() for line in lines)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Truncate to an approximate token budget, keeping the head and tail"""
+    budget = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= budget:
+        return text
+    head = budget * 3 // 4
+    tail = budget - head
+    return f"{text[:head]}\n... (truncated) ...\n{text[-tail:]}"
+
+
+# Transient failures worth retrying; anything else propagates immediately
+RETRYABLE_LLM_ERRORS = (
+    TimeoutError,
+    gapi_exceptions.ResourceExhausted,
+    gapi_exceptions.ServiceUnavailable,
+    gapi_exceptions.InternalServerError,
+    gapi_exceptions.DeadlineExceeded,
+)
+
+
+@retry(stop=stop_after_attempt(5),
+       wait=wait_random_exponential(multiplier=1, max=30),
+       retry=retry_if_exception_type(RETRYABLE_LLM_ERRORS),
+       reraise=True)
+async def call_llm(model, prompt: str):
+    """One LLM request with jittered exponential backoff on transient errors
+
+    Without the retry, a single 429/500 blip degraded a file to a stub
+    summary that then polluted the cache and the decider index.
+    """
+    return await model.generate_content_async(prompt)
+
+
+class SummaryCache:
+    """Content-addressable on-disk cache of file summaries
+
+    Keyed by (blob sha, model name, prompt version), so byte-identical files
+    across runs or repositories skip the LLM call entirely.
+    """
+
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'summaries.db'))
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, summary_json BLOB)'
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(file_data: Dict, model_name: str) -> str:
+        """Derive the cache key, preferring the blob sha GitHub already returned"""
+        sha = file_data.get('sha')
+        if sha is None:
+            raw = file_data['content']
+            sha = hashlib.sha256(raw if isinstance(raw, bytes) else raw.encode()).hexdigest()
+        return f'{sha}:{model_name}:{PROMPT_VERSION}'
+
+    def get(self, key: str) -> Optional[FileSummary]:
+        row = self._db.execute(
+            'SELECT summary_json FROM summaries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return FileSummary(**_loads(row[0]))
+
+    def set(self, key: str, summary: FileSummary):
+        self._db.execute(
+            'INSERT OR REPLACE INTO summaries (key, summary_json) VALUES (?, ?)',
+            (key, _dumps(asdict(summary)))
+        )
+        self._db.commit()
+
+
+class QACache:
+    """On-disk cache of answers keyed by (repository, normalized question)
+
+    Repeated questions skip the decider+answerer LLM chain entirely.
+    """
+
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'qa.db'))
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, result_json BLOB)'
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(repo_key: str, question: str) -> str:
+        normalized = ' '.join(question.lower().split())
+        return hashlib.sha256(f'{repo_key}\x00{normalized}'.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        row = self._db.execute(
+            'SELECT result_json FROM answers WHERE key = ?', (key,)
+        ).fetchone()
+        return _loads(row[0]) if row else None
+
+    def set(self, key: str, result: Dict):
+        self._db.execute(
+            'INSERT OR REPLACE INTO answers (key, result_json) VALUES (?, ?)',
+            (key, _dumps(result))
+        )
+        self._db.commit()
+
+
+class HTTPCache:
+    """ETag-keyed cache of GitHub API response bodies
+
+    Conditional requests answered with 304 transfer no body and don't count
+    against GitHub's primary rate limit, so warm re-fetches are nearly free.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        cache_dir = cache_dir or os.path.expanduser('~/.cache/gh_agent')
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'http_cache.db'))
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, etag TEXT, body BLOB)'
+        )
+        self._db.commit()
+
+    def get(self, url: str) -> Optional[Tuple[str, bytes]]:
+        """Return (etag, body) for url, or None"""
+        return self._db.execute(
+            'SELECT etag, body FROM responses WHERE url = ?', (url,)
+        ).fetchone()
+
+    def set(self, url: str, etag: str, body: bytes):
+        self._db.execute(
+            'INSERT OR REPLACE INTO responses (url, etag, body) VALUES (?, ?, ?)',
+            (url, etag, body)
+        )
+        self._db.commit()
+
+
+# Binary/asset extensions and vendored directories that would only waste
+# HTTP and LLM calls; filtered out before any content is fetched
+SKIP_EXTS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.pdf', '.zip', '.tar', '.gz',
+    '.woff', '.woff2', '.ttf', '.mp4', '.mp3', '.ico', '.svg',
+}
+SKIP_DIRS = {'node_modules', 'vendor', 'dist', 'build', '.git'}
+
+
+def _keep_file(path: str, size: int, max_file_size: int) -> bool:
+    """Single prefilter shared by the tarball and per-file fetch paths"""
+    if size >= max_file_size:
+        return False
+    if any(segment in SKIP_DIRS for segment in path.split('/')):
+        return False
+    return Path(path).suffix.lower() not in SKIP_EXTS
+
+
 class GitHubFetcher:
     """Agent 1: Fetches repository content from GitHub"""
-    
+
     def __init__(self, github_token: Optional[str] = None):
         self.github_token = github_token
         self.headers = {
@@ -62,7 +340,31 @@ class GitHubFetcher:
         }
         if github_token:
             self.headers['Authorization'] = f'token {github_token}'
-    
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._http_cache = HTTPCache()
+
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared session on first use so TCP/TLS connections are reused"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(
+                    limit=64, ttl_dns_cache=300, keepalive_timeout=60
+                )
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
     def parse_github_url(self, url: str) -> Tuple[str, str, str]:
         """Extract owner, repo, and branch from GitHub URL"""
         # Handle various GitHub URL formats
@@ -81,63 +383,149 @@ class GitHubFetcher:
     async def get_repo_tree(self, owner: str, repo: str, branch: str) -> List[Dict]:
         """Get the entire repository tree recursively"""
         url = f'https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1'
-        
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise Exception(f"Failed to fetch repo tree: {response.status}")
-                data = await response.json()
-                return data.get('tree', [])
-    
-    async def get_file_content(self, owner: str, repo: str, path: str, session: aiohttp.ClientSession) -> Optional[str]:
+
+        body = await self._get_with_cache(url)
+        if body is None:
+            raise Exception(f"Failed to fetch repo tree: {url}")
+        return _loads(body).get('tree', [])
+
+    @retry(stop=stop_after_attempt(5),
+           wait=wait_random_exponential(multiplier=1, max=30),
+           retry=retry_if_exception_type((TimeoutError, aiohttp.ClientError)),
+           reraise=True)
+    async def _get_with_cache(self, url: str) -> Optional[bytes]:
+        """GET url with ETag revalidation and retry on transient failures
+
+        Returns the response body, the cached body on a 304, or None for
+        non-retryable HTTP errors (e.g. 404). Server errors raise so the
+        retry decorator can back off and try again.
+        """
+        session = await self._ensure_session()
+        cached = self._http_cache.get(url)
+        headers = {'If-None-Match': cached[0]} if cached else {}
+
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                return cached[1]
+            if response.status >= 500:
+                response.raise_for_status()
+            if response.status != 200:
+                return None
+            body = await response.read()
+            etag = response.headers.get('ETag')
+            if etag:
+                self._http_cache.set(url, etag, body)
+            return body
+
+    async def get_file_content(self, owner: str, repo: str, path: str) -> Optional[str]:
         """Fetch content of a single file"""
         url = f'https://api.github.com/repos/{owner}/{repo}/contents/{path}'
-        
+
         try:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return None
-                data = await response.json()
-                
-                # Decode base64 content
-                content = base64.b64decode(data['content']).decode('utf-8', errors='ignore')
-                return content
+            body = await self._get_with_cache(url)
+            if body is None:
+                return None
+
+            # Decode base64 content
+            data = _loads(body)
+            return base64.b64decode(data['content']).decode('utf-8', errors='ignore')
         except Exception as e:
             print(f"Error fetching {path}: {e}")
             return None
     
-    async def fetch_repository(self, repo_url: str, max_file_size: int = 1_000_000) -> Dict:
-        """Fetch all files from the repository"""
+    async def fetch_repository_via_tarball(self, owner: str, repo: str, branch: str,
+                                           max_file_size: int = 1_000_000) -> List[Dict]:
+        """Fetch every file in the repository with a single tarball request
+
+        Returns file dicts shaped like _fetch_file_with_metadata's output.
+        The blob sha is recomputed locally (git hashes 'blob <len>\\0' plus
+        the bytes) so sha-keyed caching downstream still matches GitHub's.
+        """
+        url = f'https://api.github.com/repos/{owner}/{repo}/tarball/{branch}'
+
+        session = await self._ensure_session()
+        async with session.get(url) as response:
+            if response.status != 200:
+                raise Exception(f"Failed to fetch tarball: {response.status}")
+            payload = await response.read()
+
+        files = []
+        with tarfile.open(fileobj=io.BytesIO(payload), mode='r:gz') as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                # Strip the '<owner>-<repo>-<sha>/' prefix GitHub adds
+                path = member.name.split('/', 1)[1] if '/' in member.name else member.name
+                if not _keep_file(path, member.size, max_file_size):
+                    continue
+                data = tar.extractfile(member).read()
+                files.append({
+                    'path': path,
+                    'size': member.size,
+                    'sha': hashlib.sha1(b'blob %d\x00' % len(data) + data).hexdigest(),
+                    'content': data.decode('utf-8', errors='ignore')
+                })
+
+        return files
+
+    async def iter_files(self, repo_url: str, max_file_size: int = 1_000_000):
+        """Yield file dicts as they become available
+
+        The tarball path yields files while the archive is walked; the
+        per-blob fallback yields each file as its request completes
+        (asyncio.as_completed), so downstream stages can start work before
+        the whole repository has arrived.
+        """
         print(f"🔍 Fetching repository: {repo_url}")
-        start_time = datetime.now()
-        
+
         owner, repo, branch = self.parse_github_url(repo_url)
         print(f"   Owner: {owner}, Repo: {repo}, Branch: {branch}")
-        
-        # Get repository tree
+
+        # One tarball request replaces a /contents call per file; fall back to
+        # per-blob fetching if the tarball isn't available
+        try:
+            file_contents = await self.fetch_repository_via_tarball(
+                owner, repo, branch, max_file_size
+            )
+        except Exception as e:
+            print(f"⚠️ Tarball fetch failed ({e}); fetching files individually")
+        else:
+            print(f"📁 Fetched {len(file_contents)} files via tarball")
+            for file_data in file_contents:
+                yield _compress_content(file_data)
+            return
+
         tree = await self.get_repo_tree(owner, repo, branch)
-        
-        # Filter only files (not directories) and limit size
+
+        # Filter only files (not directories), limit size, and drop
+        # binary/vendored paths before spending a request on them
         files = [
-            item for item in tree 
-            if item['type'] == 'blob' and item['size'] < max_file_size
+            item for item in tree
+            if item['type'] == 'blob'
+            and _keep_file(item['path'], item['size'], max_file_size)
         ]
-        
+
         print(f"📁 Found {len(files)} files to process")
-        
-        # Fetch file contents asynchronously
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            tasks = [
-                self._fetch_file_with_metadata(owner, repo, file_item, session)
-                for file_item in files
-            ]
-            file_contents = await asyncio.gather(*tasks)
-        
-        # Filter out failed fetches
-        file_contents = [f for f in file_contents if f is not None]
-        
+
+        tasks = [
+            asyncio.ensure_future(self._fetch_file_with_metadata(owner, repo, file_item))
+            for file_item in files
+        ]
+        for task in asyncio.as_completed(tasks):
+            file_data = await task
+            if file_data is not None:
+                yield _compress_content(file_data)
+
+    async def fetch_repository(self, repo_url: str, max_file_size: int = 1_000_000) -> Dict:
+        """Fetch all files from the repository"""
+        start_time = datetime.now()
+
+        file_contents = [
+            file_data async for file_data in self.iter_files(repo_url, max_file_size)
+        ]
+
         processing_time = (datetime.now() - start_time).total_seconds()
-        
+
         # Calculate statistics
         file_types = {}
         total_size = 0
@@ -162,9 +550,9 @@ class GitHubFetcher:
             'files': file_contents
         }
     
-    async def _fetch_file_with_metadata(self, owner: str, repo: str, file_item: Dict, session: aiohttp.ClientSession) -> Optional[Dict]:
+    async def _fetch_file_with_metadata(self, owner: str, repo: str, file_item: Dict) -> Optional[Dict]:
         """Fetch file with metadata"""
-        content = await self.get_file_content(owner, repo, file_item['path'], session)
+        content = await self.get_file_content(owner, repo, file_item['path'])
         
         if content is None:
             return None
@@ -177,13 +565,37 @@ class GitHubFetcher:
         }
 
 
+# Batching knobs: files under SMALL_FILE_BYTES are packed several-per-prompt
+# to amortize the per-request network and prefill overhead
+SMALL_FILE_BYTES = 4096
+BATCH_MAX_FILES = 16
+BATCH_CHAR_BUDGET = 120_000  # roughly 30k tokens of packed content
+
+# Files whose summaries are fully determined by their name/format; these are
+# handled by cheap static extractors instead of the LLM
+LOCKFILE_NAMES = {
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'poetry.lock',
+    'pipfile.lock', 'cargo.lock', 'uv.lock', 'gemfile.lock', 'composer.lock',
+}
+HOUSEKEEPING_NAMES = {
+    'license', 'license.txt', 'license.md', 'notice', 'codeowners',
+    '.gitignore', '.gitattributes', '.dockerignore', '.editorconfig',
+}
+
+
 class SummarizerAgent:
     """Agent 2: Asynchronously summarizes files with meaningful context"""
-    
-    def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash-exp"):
+
+    def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash-exp", max_qpm: int = 60):
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(model_name)
-        self.semaphore = asyncio.Semaphore(10)  # Limit concurrent requests
+        self.model = genai.GenerativeModel(model_name, generation_config=JSON_GENERATION_CONFIG)
+        self.model_name = model_name
+        # The limiter paces requests to the Gemini QPM quota; the semaphore
+        # only caps local in-flight work
+        self.limiter = AsyncLimiter(max_qpm, 60)
+        self.max_concurrency = 32
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.cache: Optional[SummaryCache] = None  # Attached by the workflow
     
     def _get_language(self, file_path: str) -> Optional[str]:
         """Determine programming language from file extension"""
@@ -200,16 +612,148 @@ class SummarizerAgent:
         ext = Path(file_path).suffix.lower()
         return ext_to_lang.get(ext, 'Unknown')
     
+    def _make_summary(self, file_data: Dict, summary: str, purpose: str,
+                      key_concepts: List[str] = (), dependencies: List[str] = (),
+                      functions_classes: List[str] = ()) -> FileSummary:
+        """Assemble a FileSummary from precomputed fields"""
+        path = file_data['path']
+        return FileSummary(
+            path=path,
+            file_type=Path(path).suffix or 'no_extension',
+            language=self._get_language(path),
+            size=file_data['size'],
+            summary=summary,
+            key_concepts=list(key_concepts),
+            dependencies=list(dependencies),
+            functions_classes=list(functions_classes),
+            purpose=purpose,
+            timestamp=datetime.now().isoformat()
+        )
+
+    def _static_summary(self, file_data: Dict) -> Optional[FileSummary]:
+        """Deterministic summary for files that don't need an LLM pass
+
+        Covers lockfiles, housekeeping files, dependency manifests, Markdown
+        intros and small Python modules. Returns None when the file deserves
+        the full LLM treatment.
+        """
+        path = file_data['path']
+        content = _content(file_data)
+        name = Path(path).name.lower()
+        ext = Path(path).suffix.lower()
+
+        if name in LOCKFILE_NAMES:
+            return self._make_summary(
+                file_data,
+                'Machine-generated dependency lockfile pinning exact package versions.',
+                'Reproducible dependency resolution'
+            )
+
+        if name in HOUSEKEEPING_NAMES:
+            return self._make_summary(
+                file_data,
+                f'{Path(path).name} project housekeeping file.',
+                'Project housekeeping and policy'
+            )
+
+        if name == 'requirements.txt':
+            deps = [
+                re.split(r'[<>=!~\[;]', line, 1)[0].strip()
+                for line in content.splitlines()
+                if line.strip() and not line.lstrip().startswith(('#', '-'))
+            ]
+            return self._make_summary(
+                file_data,
+                'Python requirements file listing the project dependencies.',
+                'Declares Python package dependencies',
+                dependencies=[d for d in deps if d][:20]
+            )
+
+        if name == 'package.json':
+            try:
+                manifest = _loads(content)
+            except ValueError:
+                return None
+            deps = sorted({**manifest.get('dependencies', {}),
+                           **manifest.get('devDependencies', {})})
+            return self._make_summary(
+                file_data,
+                f"npm manifest for {manifest.get('name', 'the project')}.",
+                'Declares npm package metadata and dependencies',
+                dependencies=deps[:20]
+            )
+
+        if ext == '.md' and file_data['size'] < SMALL_FILE_BYTES:
+            heading = next(
+                (line.lstrip('# ').strip() for line in content.splitlines()
+                 if line.startswith('#')),
+                Path(path).stem
+            )
+            paragraph = next(
+                (block.strip().replace('\n', ' ')
+                 for block in content.split('\n\n')
+                 if block.strip() and not block.lstrip().startswith('#')),
+                ''
+            )
+            return self._make_summary(
+                file_data,
+                f'{heading}. {paragraph[:300]}'.strip(),
+                'Documentation'
+            )
+
+        if ext == '.py' and file_data['size'] < SMALL_FILE_BYTES:
+            try:
+                tree = ast.parse(content)
+            except SyntaxError:
+                return None
+            names = [
+                node.name for node in tree.body
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            ]
+            imports = []
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    imports.extend(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module:
+                    imports.append(node.module)
+            doc = ast.get_docstring(tree)
+            summary = doc.strip().split('\n')[0] if doc else (
+                f"Small Python module defining {', '.join(names[:5])}." if names
+                else 'Small Python module.'
+            )
+            return self._make_summary(
+                file_data,
+                summary,
+                'Python module',
+                dependencies=sorted(set(imports))[:20],
+                functions_classes=names[:10]
+            )
+
+        return None
+
     async def summarize_file(self, file_data: Dict) -> FileSummary:
         """Summarize a single file with rich context"""
+        # Trivially classifiable files never reach the LLM
+        static = self._static_summary(file_data)
+        if static is not None:
+            return static
+
+        # Cache hit: identical content was summarized before, skip the LLM
+        cache_key = None
+        if self.cache is not None:
+            cache_key = SummaryCache.make_key(file_data, self.model_name)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         async with self.semaphore:
             path = file_data['path']
-            content = file_data['content']
+            content = _content(file_data)
             size = file_data['size']
             
-            # Skip binary or very large files
-            if size > 100000:  # Limit content size for summarization
-                content = content[:100000] + "\n... (truncated)"
+            # Strip prompt-wasting noise and truncate by (approximate) tokens
+            # rather than bytes
+            content = truncate_tokens(sanitize_content(content), SUMMARY_CONTENT_TOKENS)
             
             language = self._get_language(path)
             file_type = Path(path).suffix or 'no_extension'
@@ -243,36 +787,21 @@ Purpose should be specific about what problem this file solves.
 Return ONLY valid JSON, no markdown formatting."""
 
             try:
-                response = await asyncio.to_thread(
-                    self.model.generate_content,
-                    prompt
-                )
-                
+                async with self.limiter:
+                    response = await call_llm(self.model, prompt)
+
                 # Parse JSON response
-                response_text = response.text.strip()
-                # Remove markdown code blocks if present
-                if response_text.startswith('```json'):
-                    response_text = response_text[7:]
-                if response_text.startswith('```'):
-                    response_text = response_text[3:]
-                if response_text.endswith('```'):
-                    response_text = response_text[:-3]
-                
-                analysis = json.loads(response_text.strip())
-                
-                return FileSummary(
-                    path=path,
-                    file_type=file_type,
-                    language=language,
-                    size=size,
-                    summary=analysis.get('summary', 'No summary available'),
-                    key_concepts=analysis.get('key_concepts', []),
-                    dependencies=analysis.get('dependencies', []),
-                    functions_classes=analysis.get('functions_classes', []),
-                    purpose=analysis.get('purpose', 'Unknown purpose'),
-                    timestamp=datetime.now().isoformat()
-                )
-                
+                analysis = _loads(extract_json(response.text))
+
+                summary = self._summary_from_analysis(file_data, analysis)
+
+                # Only successful summaries are cached; error stubs would
+                # poison future runs
+                if self.cache is not None:
+                    self.cache.set(cache_key, summary)
+
+                return summary
+
             except Exception as e:
                 print(f"❌ Error summarizing {path}: {e}")
                 # Return a basic summary on error
@@ -289,34 +818,313 @@ Return ONLY valid JSON, no markdown formatting."""
                     timestamp=datetime.now().isoformat()
                 )
     
+    def _summary_from_analysis(self, file_data: Dict, analysis: Dict) -> FileSummary:
+        """Build a FileSummary from a parsed LLM analysis dict"""
+        path = file_data['path']
+        return FileSummary(
+            path=path,
+            file_type=Path(path).suffix or 'no_extension',
+            language=self._get_language(path),
+            size=file_data['size'],
+            summary=analysis.get('summary', 'No summary available'),
+            key_concepts=analysis.get('key_concepts', []),
+            dependencies=analysis.get('dependencies', []),
+            functions_classes=analysis.get('functions_classes', []),
+            purpose=analysis.get('purpose', 'Unknown purpose'),
+            timestamp=datetime.now().isoformat()
+        )
+
+    async def _summarize_batch(self, batch: List[Dict]) -> List[FileSummary]:
+        """Summarize several small files in a single LLM round-trip
+
+        Cache hits are answered locally; the remaining files are packed into
+        one delimited prompt that asks for a JSON array of summaries. Files
+        the model misses (or a failed parse) fall back to the per-file path.
+        """
+        summaries = []
+        pending = []
+
+        for file_data in batch:
+            static = self._static_summary(file_data)
+            if static is not None:
+                summaries.append(static)
+                continue
+            if self.cache is not None:
+                cached = self.cache.get(SummaryCache.make_key(file_data, self.model_name))
+                if cached is not None:
+                    summaries.append(cached)
+                    continue
+            pending.append(file_data)
+
+        if not pending:
+            return summaries
+
+        sections = "\n".join(
+            f"=== FILE {i}: {fd['path']} ===\n{_content(fd)}\n=== END {i} ==="
+            for i, fd in enumerate(pending)
+        )
+
+        prompt = f"""Analyze each of the following {len(pending)} files and summarize every one of them.
+
+{sections}
+
+Provide your response in the following JSON format:
+{{
+    "summaries": [
+        {{
+            "index": 0,
+            "summary": "A concise 2-3 sentence summary of what this file does",
+            "key_concepts": ["concept1", "concept2"],
+            "dependencies": ["dependency1", "dependency2"],
+            "functions_classes": ["function/class names"],
+            "purpose": "The main purpose/role of this file in the project"
+        }}
+    ]
+}}
+
+Include exactly one entry per file, using the FILE index shown in its delimiter.
+Return ONLY valid JSON, no markdown formatting."""
+
+        missing = pending
+        try:
+            async with self.limiter:
+                response = await call_llm(self.model, prompt)
+
+            parsed = _loads(extract_json(response.text))
+            by_index = {
+                int(entry['index']): entry
+                for entry in parsed.get('summaries', [])
+                if 'index' in entry
+            }
+
+            missing = []
+            for i, file_data in enumerate(pending):
+                analysis = by_index.get(i)
+                if analysis is None:
+                    missing.append(file_data)
+                    continue
+                summary = self._summary_from_analysis(file_data, analysis)
+                if self.cache is not None:
+                    self.cache.set(SummaryCache.make_key(file_data, self.model_name), summary)
+                summaries.append(summary)
+
+        except Exception as e:
+            print(f"❌ Batch summarization failed ({e}); retrying files individually")
+
+        if missing:
+            summaries.extend(
+                await asyncio.gather(*(self.summarize_file(fd) for fd in missing))
+            )
+
+        return summaries
+
+    async def iter_summaries(self, files):
+        """Yield FileSummary objects as each file finishes summarizing
+
+        Accepts either a list or an async iterator of file dicts, so the
+        fetch stage can be pipelined straight into summarization. Files
+        stream through a bounded queue into a fixed worker pool, so memory
+        stays flat regardless of repository size and downstream consumers
+        can start on the first summary while the rest are still in flight.
+        Byte-identical files are summarized once and the result is fanned
+        back out to every duplicate path.
+        """
+        async def _aiter(source):
+            if hasattr(source, '__aiter__'):
+                async for item in source:
+                    yield item
+            else:
+                for item in source:
+                    yield item
+
+        # Dedup bookkeeping: first path seen for each content hash is the
+        # representative; later arrivals become clones of its summary
+        rep_path_by_hash: Dict[str, str] = {}
+        pending_dups: Dict[str, List[Dict]] = {}
+        emitted: Dict[str, FileSummary] = {}
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+        workers = []
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, list):
+                    for summary in await self._summarize_batch(item):
+                        results.put_nowait(summary)
+                else:
+                    results.put_nowait(await self.summarize_file(item))
+
+        async def producer():
+            # Pack small files into multi-file prompts; large ones go through
+            # the per-file path unchanged
+            batch, batch_chars = [], 0
+            async for file_data in _aiter(files):
+                content_hash = file_data.get('sha')
+                if content_hash is None:
+                    raw = file_data['content']
+                    content_hash = hashlib.blake2b(
+                        raw if isinstance(raw, bytes) else raw.encode(), digest_size=16
+                    ).hexdigest()
+                rep_path = rep_path_by_hash.get(content_hash)
+                if rep_path is not None:
+                    rep_summary = emitted.get(rep_path)
+                    if rep_summary is not None:
+                        # Representative already summarized; clone it now
+                        results.put_nowait(replace(
+                            rep_summary, path=file_data['path'], size=file_data['size']
+                        ))
+                    else:
+                        pending_dups.setdefault(rep_path, []).append(file_data)
+                    continue
+                rep_path_by_hash[content_hash] = file_data['path']
+
+                if file_data['size'] >= SMALL_FILE_BYTES:
+                    await queue.put(file_data)
+                    continue
+                batch.append(file_data)
+                batch_chars += file_data['size']
+                if len(batch) >= BATCH_MAX_FILES or batch_chars >= BATCH_CHAR_BUDGET:
+                    await queue.put(batch)
+                    batch, batch_chars = [], 0
+            if batch:
+                await queue.put(batch)
+            for _ in workers:
+                await queue.put(None)
+
+        async def closer():
+            # Once the producer and every worker are done, no more results
+            # can arrive; wake the consumer with a sentinel
+            await producer_task
+            await asyncio.gather(*workers)
+            results.put_nowait(None)
+
+        workers.extend(
+            asyncio.create_task(worker()) for _ in range(self.max_concurrency)
+        )
+        producer_task = asyncio.create_task(producer())
+        closer_task = asyncio.create_task(closer())
+
+        try:
+            while True:
+                summary = await results.get()
+                if summary is None:
+                    break
+                emitted[summary.path] = summary
+                dups = pending_dups.pop(summary.path, ())
+                yield summary
+                # Clone the summary for every byte-identical duplicate
+                for dup in dups:
+                    yield replace(summary, path=dup['path'], size=dup['size'])
+        finally:
+            producer_task.cancel()
+            closer_task.cancel()
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(
+                producer_task, closer_task, *workers, return_exceptions=True
+            )
+
     async def summarize_all_files(self, files: List[Dict]) -> List[FileSummary]:
         """Asynchronously summarize all files"""
         print(f"🤖 Summarizing {len(files)} files asynchronously...")
         start_time = datetime.now()
-        
-        tasks = [self.summarize_file(file_data) for file_data in files]
-        summaries = await asyncio.gather(*tasks)
-        
+
+        summaries = [summary async for summary in self.iter_summaries(files)]
+
         processing_time = (datetime.now() - start_time).total_seconds()
         print(f"✅ Completed summarization in {processing_time:.2f}s")
-        
+
         return summaries
 
 
+# The LLM prompt only ever sees this many candidate files; a local BM25 pass
+# whittles larger repos down first so prompt size stays flat
+SHORTLIST_SIZE = 50
+
+
 class DeciderAgent:
     """Agent 3: Intelligently selects relevant files based on user questions"""
-    
-    def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash-exp"):
+
+    def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash-exp", max_qpm: int = 60):
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(model_name)
-    
+        self.model = genai.GenerativeModel(model_name, generation_config=JSON_GENERATION_CONFIG)
+        self.limiter = AsyncLimiter(max_qpm, 60)
+        # BM25 index state, rebuilt whenever a different summaries list arrives
+        self._indexed_summaries: Optional[List[FileSummary]] = None
+        self._index_docs: List[Tuple[Dict[str, int], int]] = []
+        self._index_df: Dict[str, int] = {}
+        self._index_avgdl = 0.0
+
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        return re.findall(r'[a-z0-9_]+', text.lower())
+
+    def _build_index(self, summaries: List[FileSummary]):
+        """Tokenize every summary once into per-doc term frequencies"""
+        docs = []
+        df: Dict[str, int] = {}
+        for summary in summaries:
+            tokens = self._tokenize(
+                f"{summary.path} {summary.summary} {summary.purpose} "
+                f"{' '.join(summary.key_concepts)}"
+            )
+            tf: Dict[str, int] = {}
+            for token in tokens:
+                tf[token] = tf.get(token, 0) + 1
+            docs.append((tf, len(tokens)))
+            for token in tf:
+                df[token] = df.get(token, 0) + 1
+
+        self._index_docs = docs
+        self._index_df = df
+        self._index_avgdl = sum(dl for _, dl in docs) / len(docs) if docs else 0.0
+        self._indexed_summaries = summaries
+
+    def _shortlist(self, question: str, summaries: List[FileSummary], n: int) -> List[int]:
+        """Return indices of the n best BM25 matches for the question"""
+        if self._indexed_summaries is not summaries:
+            self._build_index(summaries)
+
+        query_terms = set(self._tokenize(question))
+        total_docs = len(summaries)
+        k1, b = 1.5, 0.75
+
+        scored = []
+        for i, (tf, dl) in enumerate(self._index_docs):
+            score = 0.0
+            for term in query_terms:
+                freq = tf.get(term)
+                if not freq:
+                    continue
+                df = self._index_df[term]
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                score += idf * freq * (k1 + 1) / (
+                    freq + k1 * (1 - b + b * dl / self._index_avgdl)
+                )
+            scored.append((score, i))
+
+        scored.sort(reverse=True)
+        return [i for _, i in scored[:n]]
+
     async def select_relevant_files(self, question: str, summaries: List[FileSummary], top_k: int = 10) -> List[str]:
         """Select the most relevant files for answering the question"""
         print(f"🎯 Selecting relevant files for question: {question[:100]}...")
-        
-        # Create a comprehensive summary index
+
+        # Shrink large repos to a local shortlist before involving the LLM
+        if len(summaries) > SHORTLIST_SIZE:
+            candidates = self._shortlist(question, summaries, SHORTLIST_SIZE)
+        else:
+            candidates = list(range(len(summaries)))
+
+        # Create a comprehensive summary index over the candidates; the
+        # prompt numbering is positional and mapped back afterwards
         summary_index = []
-        for i, summary in enumerate(summaries):
+        for i, orig_idx in enumerate(candidates):
+            summary = summaries[orig_idx]
             summary_text = f"""
 File {i}: {summary.path}
 Language: {summary.language}
@@ -350,25 +1158,17 @@ Return your response as a JSON array of file indices (0-based):
 Return ONLY valid JSON, no explanation or markdown."""
 
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                prompt
-            )
-            
-            response_text = response.text.strip()
-            # Clean up response
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            result = json.loads(response_text.strip())
+            async with self.limiter:
+                response = await call_llm(self.model, prompt)
+
+            result = _loads(extract_json(response.text))
             selected_indices = result.get('selected_files', [])
-            
-            # Get file paths
-            selected_paths = [summaries[i].path for i in selected_indices if i < len(summaries)]
+
+            # Map prompt-local indices back to the original summaries
+            selected_paths = [
+                summaries[candidates[i]].path
+                for i in selected_indices if i < len(candidates)
+            ]
             
             print(f"✅ Selected {len(selected_paths)} files")
             for path in selected_paths[:5]:
@@ -399,31 +1199,32 @@ Return ONLY valid JSON, no explanation or markdown."""
 class AnsweringAgent:
     """Agent 4: Provides accurate, grounded answers using selected files"""
     
-    def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash-exp"):
+    def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash-exp", max_qpm: int = 60):
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
-    
+        self.limiter = AsyncLimiter(max_qpm, 60)
+
     async def answer_question(self, question: str, selected_files: List[Dict], summaries: List[FileSummary]) -> str:
         """Answer the question using selected file contents"""
         print(f"💬 Generating answer...")
         
-        # Build context from selected files
+        # Build context from selected files; index summaries by path once
+        # instead of scanning the whole list per file
+        summary_by_path = {s.path: s for s in summaries}
         context_parts = []
         for file_data in selected_files:
             path = file_data['path']
-            content = file_data['content']
-            
-            # Find corresponding summary
-            summary = next((s for s in summaries if s.path == path), None)
-            
+            content = _content(file_data)
+
+            summary = summary_by_path.get(path)
+
             context_part = f"""
 === File: {path} ===
 Summary: {summary.summary if summary else 'N/A'}
 Purpose: {summary.purpose if summary else 'N/A'}
 
 Content:
-{content[:5000]}  # Limit content length
-{'... (truncated)' if len(content) > 5000 else ''}
+{truncate_tokens(sanitize_content(content), ANSWER_CONTENT_TOKENS)}
 """
             context_parts.append(context_part.strip())
         
@@ -453,11 +1254,9 @@ Provide a detailed, accurate answer based on the file contents above. Include:
 Your answer:"""
 
         try:
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                prompt
-            )
-            
+            async with self.limiter:
+                response = await call_llm(self.model, prompt)
+
             answer = response.text.strip()
             print(f"✅ Answer generated ({len(answer)} characters)")
             
@@ -471,15 +1270,17 @@ Your answer:"""
 class GitHubAgentWorkflow:
     """Main workflow orchestrator"""
     
-    def __init__(self, gemini_api_key: str, github_token: Optional[str] = None):
+    def __init__(self, gemini_api_key: str, github_token: Optional[str] = None, max_qpm: int = 60):
         self.fetcher = GitHubFetcher(github_token)
-        self.summarizer = SummarizerAgent(gemini_api_key)
-        self.decider = DeciderAgent(gemini_api_key)
-        self.answerer = AnsweringAgent(gemini_api_key)
+        self.summarizer = SummarizerAgent(gemini_api_key, max_qpm=max_qpm)
+        self.decider = DeciderAgent(gemini_api_key, max_qpm=max_qpm)
+        self.answerer = AnsweringAgent(gemini_api_key, max_qpm=max_qpm)
         
         self.repo_data = None
         self.summaries = None
         self.summary_path = None
+        self._qa_cache: Optional[QACache] = None
+        self._file_index: Dict[str, Dict] = {}
     
     async def process_repository(self, repo_url: str, output_dir: str = "./repo_analysis") -> str:
         """Process the entire repository and create summaries"""
@@ -487,26 +1288,67 @@ class GitHubAgentWorkflow:
         print("🚀 GITHUB REPOSITORY AGENT WORKFLOW")
         print("=" * 80)
         
-        # Step 1: Fetch repository
-        self.repo_data = await self.fetcher.fetch_repository(repo_url)
-        
-        # Step 2: Summarize all files asynchronously
-        self.summaries = await self.summarizer.summarize_all_files(self.repo_data['files'])
-        
-        # Step 3: Save summaries to file
-        os.makedirs(output_dir, exist_ok=True)
+        start_time = datetime.now()
+
+        self.summarizer.cache = SummaryCache(os.path.join(output_dir, '.summary_cache'))
+
+        await asyncio.to_thread(os.makedirs, output_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        summary_filename = f"repo_summary_{timestamp}.json"
+        summary_filename = f"repo_summary_{timestamp}.jsonl"
         self.summary_path = os.path.join(output_dir, summary_filename)
-        
-        summary_data = {
-            'metadata': self.repo_data['metadata'],
-            'summaries': [asdict(s) for s in self.summaries]
-        }
-        
-        with open(self.summary_path, 'w', encoding='utf-8') as f:
-            json.dump(summary_data, f, indent=2, ensure_ascii=False)
-        
+
+        files: List[Dict] = []
+        self.summaries = []
+
+        # Fetch and summarization run as a pipeline: files flow from
+        # iter_files straight into iter_summaries as each one lands, so wall
+        # time approaches max(fetch, summarize) instead of their sum. Each
+        # summary streams to disk as a JSONL line so peak memory stays flat;
+        # writes go to a temp file that is renamed into place once complete,
+        # so readers never see a half-written summary.
+        tmp_path = f'{self.summary_path}.tmp'
+        async with self.fetcher:
+            async def file_stream():
+                async for file_data in self.fetcher.iter_files(repo_url):
+                    files.append(file_data)
+                    yield file_data
+
+            print("🤖 Summarizing files as they arrive...")
+            async with aiofiles.open(tmp_path, 'w', encoding='utf-8') as f:
+                async for summary in self.summarizer.iter_summaries(file_stream()):
+                    self.summaries.append(summary)
+                    await f.write(_dumps(asdict(summary)) + "\n")
+
+                processing_time = (datetime.now() - start_time).total_seconds()
+
+                file_types = {}
+                total_size = 0
+                for file_data in files:
+                    ext = Path(file_data['path']).suffix or 'no_extension'
+                    file_types[ext] = file_types.get(ext, 0) + 1
+                    total_size += file_data['size']
+
+                metadata = RepoMetadata(
+                    repo_url=repo_url,
+                    total_files=len(files),
+                    file_types=file_types,
+                    total_size=total_size,
+                    processing_time=processing_time,
+                    timestamp=datetime.now().isoformat()
+                )
+
+                # Totals are only known once the pipeline drains, so the
+                # metadata record goes last; the loader accepts it on any line
+                await f.write(_dumps({'type': 'metadata', **asdict(metadata)}) + "\n")
+
+        await asyncio.to_thread(os.replace, tmp_path, self.summary_path)
+
+        self.repo_data = {'metadata': asdict(metadata), 'files': files}
+        # Index contents by path once; ask_question does O(1) lookups on it
+        self._file_index = {f['path']: f for f in files}
+
+        print(f"✅ Processed {len(files)} files in {processing_time:.2f}s")
+
         print(f"\n📄 Summary saved to: {self.summary_path}")
         print("=" * 80)
         
@@ -520,14 +1362,31 @@ class GitHubAgentWorkflow:
         print("\n" + "=" * 80)
         print(f"❓ QUESTION: {question}")
         print("=" * 80)
-        
+
+        # Identical questions about the same repository are answered from disk
+        if self.repo_data:
+            repo_key = self.repo_data['metadata']['repo_url']
+        else:
+            repo_key = self.summary_path or ''
+
+        if self._qa_cache is None:
+            cache_dir = os.path.dirname(self.summary_path) if self.summary_path else './repo_analysis'
+            self._qa_cache = QACache(os.path.join(cache_dir, '.qa_cache'))
+
+        qa_key = QACache.make_key(repo_key, question)
+        cached = self._qa_cache.get(qa_key)
+        if cached is not None:
+            print("💾 Answer served from Q&A cache")
+            print(cached['answer'])
+            print("=" * 80)
+            return cached
+
         # Step 1: Select relevant files
         selected_paths = await self.decider.select_relevant_files(question, self.summaries, top_k)
         
-        # Step 2: Get full content of selected files
+        # Step 2: Get full content of selected files from the path index
         selected_files = [
-            file_data for file_data in self.repo_data['files']
-            if file_data['path'] in selected_paths
+            self._file_index[path] for path in selected_paths if path in self._file_index
         ]
         
         # Step 3: Generate answer
@@ -539,7 +1398,9 @@ class GitHubAgentWorkflow:
             'answer': answer,
             'timestamp': datetime.now().isoformat()
         }
-        
+
+        self._qa_cache.set(qa_key, result)
+
         print("\n" + "=" * 80)
         print("📝 ANSWER:")
         print("=" * 80)
@@ -548,12 +1409,32 @@ class GitHubAgentWorkflow:
         
         return result
     
-    def load_existing_summary(self, summary_path: str):
-        """Load previously created summary"""
-        with open(summary_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        self.summaries = [FileSummary(**s) for s in data['summaries']]
+    def load_existing_summary(self, summary_path: str, size_hint: Optional[int] = None):
+        """Load previously created summary
+
+        size_hint, when supplied (e.g. from an os.stat the caller already
+        paid for), lets the read pre-size its buffer instead of growing it.
+
+        Handles both the streamed JSONL layout (one summary per line plus a
+        tagged metadata record on any line) and the older single-JSON files.
+        """
+        if summary_path.endswith('.jsonl'):
+            summaries = []
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = _loads(line)
+                    if record.get('type') == 'metadata':
+                        continue
+                    summaries.append(FileSummary(**record))
+            self.summaries = summaries
+        else:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                data = _loads(f.read(size_hint) if size_hint else f.read())
+            self.summaries = [FileSummary(**s) for s in data['summaries']]
+
         self.summary_path = summary_path
         print(f"✅ Loaded {len(self.summaries)} file summaries from {summary_path}")
 
@@ -590,11 +1471,11 @@ async def main():
         results.append(result)
         print("\n")
     
-    # Save Q&A results
+    # Save Q&A results off the event loop
     qa_path = summary_path.replace('repo_summary', 'qa_results')
-    with open(qa_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
-    
+    qa_path = qa_path.replace('.jsonl', '.json')
+    await asyncio.to_thread(_write_json_atomic, qa_path, results)
+
     print(f"\n✅ Q&A results saved to: {qa_path}")
 
 
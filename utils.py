@@ -8,71 +8,213 @@ This module provides helper functions for:
 - Export to different formats
 """
 
+import heapq
 import json
 import os
+import re
+import sys
 from typing import List, Dict, Optional
-from collections import Counter
+from collections import Counter, defaultdict
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many files the Python comprehension wins; above it the
+# vectorized NumPy mask pays for the array conversion many times over
+_NUMPY_MIN_FILES = 10_000
+
+
+# Parsed analyzers keyed by (path, mtime); exporters and comparisons reuse
+# one instance per file instead of re-reading and re-aggregating the JSON
+_ANALYZER_CACHE: Dict[tuple, 'SummaryAnalyzer'] = {}
+
+
+@dataclass
+class RepoAggregates:
+    """Snapshot of every aggregate the formatters consume
+
+    Computed once per analyzer; report, markdown, CSV and comparison all
+    read this instead of re-deriving their own slices.
+    """
+    languages: Counter
+    dependencies: Counter
+    concepts: Counter
+    file_types: Counter
+    largest: List[Dict]
 
 
 class SummaryAnalyzer:
     """Analyze and visualize repository summaries"""
-    
+
     def __init__(self, summary_path: str):
-        """Load summary data"""
-        with open(summary_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
-        
-        self.metadata = self.data.get('metadata', {})
-        self.summaries = self.data.get('summaries', [])
+        """Load summary data
+
+        JSONL summaries stream naturally line by line. Legacy single-JSON
+        files stream through ijson when it is installed, so the whole
+        parsed document never has to sit in memory alongside the summary
+        objects; without ijson they fall back to a plain json.load.
+        """
+        self.metadata = {}
+        self.summaries = []
+
+        if summary_path.endswith('.jsonl'):
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = _json_loads(line)
+                    if record.get('type') == 'metadata':
+                        del record['type']
+                        self.metadata = record
+                    else:
+                        self.summaries.append(record)
+        elif ijson is not None:
+            with open(summary_path, 'rb') as f:
+                self.metadata = next(ijson.items(f, 'metadata'), {})
+                f.seek(0)
+                self.summaries = list(ijson.items(f, 'summaries.item'))
+        else:
+            # Reading bytes lets orjson decode UTF-8 internally in C
+            data = _json_loads(Path(summary_path).read_bytes())
+            self.metadata = data.get('metadata', {})
+            self.summaries = data.get('summaries', [])
+
+        self._build_counters()
+
+    @classmethod
+    def from_path(cls, summary_path: str) -> 'SummaryAnalyzer':
+        """Return a cached analyzer for the file, loading it on first use
+
+        A changed mtime evicts the stale entry, so edits to the summary
+        file are picked up on the next call.
+        """
+        key = (summary_path, os.path.getmtime(summary_path))
+        analyzer = _ANALYZER_CACHE.get(key)
+        if analyzer is None:
+            for stale in [k for k in _ANALYZER_CACHE if k[0] == summary_path]:
+                del _ANALYZER_CACHE[stale]
+            _ANALYZER_CACHE[key] = analyzer = cls(summary_path)
+        return analyzer
+
+    def _build_counters(self):
+        """Fold every aggregate counter in one pass over the summaries
+
+        Counter.update runs the tally in C, so feeding it each summary's
+        lists directly also avoids the big intermediate all-deps/all-concepts
+        lists the old per-getter loops built.
+        """
+        self._lang_counter = Counter()
+        self._dep_counter = Counter()
+        self._concept_counter = Counter()
+        # File-type tallies come straight from the metadata; a Counter
+        # gives the report most_common() instead of a sorted(items()) pass
+        self._file_type_counter = Counter(self.metadata.get('file_types', {}))
+        # Lowercased searchable blob per summary, built once so repeated
+        # keyword searches are a plain substring test
+        self._search_index = []
+        # Sizes as a parallel array: the numeric passes (largest files,
+        # size-range filters) walk a flat int list instead of pulling one
+        # field out of every dict
+        self._sizes = []
+        # Summaries grouped by lowercased language for O(1) language filters
+        self._by_lang = defaultdict(list)
+        # NumPy copy of _sizes, materialized on first large size-range query
+        self._sizes_np = None
+        for summary in self.summaries:
+            # Normalize missing keys once so this loop and every later
+            # consumer can subscript directly instead of paying
+            # .get-with-default per access
+            summary.setdefault('dependencies', ())
+            summary.setdefault('key_concepts', ())
+            summary.setdefault('language', None)
+            self._sizes.append(summary['size'])
+            language = summary['language']
+            self._by_lang[(language or '').lower()].append(summary)
+            self._dep_counter.update(summary['dependencies'])
+            self._concept_counter.update(summary['key_concepts'])
+            if language:
+                self._lang_counter[language] += 1
+            self._search_index.append((
+                summary,
+                f"{summary['path']} {summary['summary']} {summary['purpose']}".lower()
+            ))
     
+    @cached_property
+    def aggregates(self) -> RepoAggregates:
+        """The formatter-facing aggregate snapshot"""
+        return RepoAggregates(
+            languages=self._lang_counter,
+            dependencies=self._dep_counter,
+            concepts=self._concept_counter,
+            file_types=self._file_type_counter,
+            largest=self.get_largest_files(10),
+        )
+
     def get_language_distribution(self) -> Dict[str, int]:
         """Get count of files by programming language"""
-        languages = [s['language'] for s in self.summaries if s.get('language')]
-        return dict(Counter(languages))
-    
+        return dict(self._lang_counter)
+
     def get_top_dependencies(self, top_n: int = 10) -> List[tuple]:
         """Get most common dependencies across all files"""
-        all_deps = []
-        for summary in self.summaries:
-            all_deps.extend(summary.get('dependencies', []))
-        
-        dep_counts = Counter(all_deps)
-        return dep_counts.most_common(top_n)
-    
+        return self._dep_counter.most_common(top_n)
+
     def get_top_concepts(self, top_n: int = 20) -> List[tuple]:
         """Get most common key concepts"""
-        all_concepts = []
-        for summary in self.summaries:
-            all_concepts.extend(summary.get('key_concepts', []))
-        
-        concept_counts = Counter(all_concepts)
-        return concept_counts.most_common(top_n)
+        return self._concept_counter.most_common(top_n)
     
     def search_summaries(self, keyword: str) -> List[Dict]:
         """Search for files containing a keyword"""
         keyword_lower = keyword.lower()
-        matching = []
-        
-        for summary in self.summaries:
-            searchable = f"{summary['path']} {summary['summary']} {summary['purpose']}".lower()
-            if keyword_lower in searchable:
-                matching.append(summary)
-        
-        return matching
+        return [s for s, blob in self._search_index if keyword_lower in blob]
+
+    def filter_by_language(self, language: str) -> List[Dict]:
+        """Get all summaries for a language via the precomputed index"""
+        return self._by_lang.get(language.lower(), [])
     
-    def get_files_by_size(self, min_size: int = 0, max_size: int = float('inf')) -> List[Dict]:
-        """Get files within a size range"""
+    def get_files_by_size(self, min_size: int = 0, max_size: int = sys.maxsize) -> List[Dict]:
+        """Get files within a size range
+
+        The default upper bound is an int so the common no-max case stays
+        on CPython's fast int-int comparison path instead of coercing
+        every size to float against float('inf').
+        """
+        if np is not None and len(self._sizes) >= _NUMPY_MIN_FILES:
+            if self._sizes_np is None:
+                self._sizes_np = np.fromiter(
+                    self._sizes, dtype=np.int64, count=len(self._sizes)
+                )
+            mask = (self._sizes_np >= min_size) & (self._sizes_np <= max_size)
+            return [self.summaries[i] for i in np.nonzero(mask)[0].tolist()]
         return [
-            s for s in self.summaries 
-            if min_size <= s['size'] <= max_size
+            s for s, size in zip(self.summaries, self._sizes)
+            if min_size <= size <= max_size
         ]
-    
+
     def get_largest_files(self, top_n: int = 10) -> List[Dict]:
         """Get largest files"""
-        sorted_files = sorted(self.summaries, key=lambda x: x['size'], reverse=True)
-        return sorted_files[:top_n]
+        # Partial sort over the size array: O(N log k), no dict lookups
+        idx = heapq.nlargest(top_n, range(len(self._sizes)), key=self._sizes.__getitem__)
+        return [self.summaries[i] for i in idx]
     
     def generate_report(self, output_path: str = None) -> str:
         """Generate a comprehensive analysis report"""
@@ -88,47 +230,55 @@ class SummaryAnalyzer:
         report_lines.append(f"Total Size: {self.metadata.get('total_size', 0) / 1024:.2f} KB")
         report_lines.append(f"Processing Time: {self.metadata.get('processing_time', 0):.2f}s")
         
+        # Section bodies extend the list from generators in one call rather
+        # than bouncing through report_lines.append per row
+        n = len(self.summaries)
+        agg = self.aggregates
+
         # Language distribution
         report_lines.append("\n" + "="*80)
         report_lines.append("Language Distribution")
         report_lines.append("="*80)
-        lang_dist = self.get_language_distribution()
-        for lang, count in sorted(lang_dist.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / len(self.summaries)) * 100
-            report_lines.append(f"{lang:20s}: {count:4d} files ({percentage:5.1f}%)")
-        
+        report_lines.extend(
+            f"{lang:20s}: {count:4d} files ({count / n * 100:5.1f}%)"
+            for lang, count in agg.languages.most_common()
+        )
+
         # Top dependencies
         report_lines.append("\n" + "="*80)
         report_lines.append("Top 10 Dependencies")
         report_lines.append("="*80)
-        top_deps = self.get_top_dependencies(10)
-        for dep, count in top_deps:
-            report_lines.append(f"{dep:30s}: {count:3d} occurrences")
-        
+        report_lines.extend(
+            f"{dep:30s}: {count:3d} occurrences"
+            for dep, count in agg.dependencies.most_common(10)
+        )
+
         # Top concepts
         report_lines.append("\n" + "="*80)
         report_lines.append("Top 20 Key Concepts")
         report_lines.append("="*80)
-        top_concepts = self.get_top_concepts(20)
-        for concept, count in top_concepts:
-            report_lines.append(f"{concept:30s}: {count:3d} files")
-        
+        report_lines.extend(
+            f"{concept:30s}: {count:3d} files"
+            for concept, count in agg.concepts.most_common(20)
+        )
+
         # Largest files
         report_lines.append("\n" + "="*80)
         report_lines.append("10 Largest Files")
         report_lines.append("="*80)
-        largest = self.get_largest_files(10)
-        for f in largest:
-            size_kb = f['size'] / 1024
-            report_lines.append(f"{f['path']:50s}: {size_kb:8.2f} KB")
-        
+        report_lines.extend(
+            f"{f['path']:50s}: {f['size'] / 1024:8.2f} KB"
+            for f in agg.largest
+        )
+
         # File type distribution
         report_lines.append("\n" + "="*80)
         report_lines.append("File Type Distribution")
         report_lines.append("="*80)
-        file_types = self.metadata.get('file_types', {})
-        for ext, count in sorted(file_types.items(), key=lambda x: x[1], reverse=True):
-            report_lines.append(f"{ext:20s}: {count:4d} files")
+        report_lines.extend(
+            f"{ext:20s}: {count:4d} files"
+            for ext, count in agg.file_types.most_common()
+        )
         
         report = "\n".join(report_lines)
         
@@ -142,22 +292,31 @@ class SummaryAnalyzer:
 
 class FileFilter:
     """Advanced file filtering utilities"""
-    
+
+    # One compiled, case-insensitive scan replaces four substring searches
+    # plus a .lower() allocation per file in exclude_tests
+    _TEST_RE = re.compile(r'(?:test_|_test\.|/tests?/)', re.IGNORECASE)
+
     @staticmethod
     def filter_by_extension(files: List[Dict], extensions: List[str]) -> List[Dict]:
         """Filter files by extension"""
-        return [
-            f for f in files 
-            if any(f['path'].endswith(ext) for ext in extensions)
-        ]
+        # str.endswith matches a tuple of suffixes in one C call
+        exts = tuple(extensions)
+        return [f for f in files if f['path'].endswith(exts)]
     
     @staticmethod
-    def filter_by_directory(files: List[Dict], directory: str) -> List[Dict]:
-        """Filter files in a specific directory"""
-        return [
-            f for f in files 
-            if f['path'].startswith(directory)
-        ]
+    def filter_by_directory(files: List[Dict], directory: 'str | tuple') -> List[Dict]:
+        """Filter files under one directory, or several in a single pass
+
+        Accepts a single directory or a tuple of them; prefixes are
+        normalized to end with '/' so 'src' no longer matches
+        'src_legacy/...'. str.startswith checks the whole tuple in C.
+        """
+        if isinstance(directory, tuple):
+            prefixes = tuple(d.rstrip('/') + '/' for d in directory)
+        else:
+            prefixes = (directory.rstrip('/') + '/',)
+        return [f for f in files if f['path'].startswith(prefixes)]
     
     @staticmethod
     def filter_by_language(summaries: List[Dict], language: str) -> List[Dict]:
@@ -170,163 +329,178 @@ class FileFilter:
     @staticmethod
     def exclude_tests(files: List[Dict]) -> List[Dict]:
         """Exclude test files"""
-        test_patterns = ['test_', '_test.', '/tests/', '/test/']
-        return [
-            f for f in files 
-            if not any(pattern in f['path'].lower() for pattern in test_patterns)
-        ]
+        return [f for f in files if not FileFilter._TEST_RE.search(f['path'])]
     
     @staticmethod
     def exclude_config(files: List[Dict]) -> List[Dict]:
         """Exclude configuration files"""
-        config_exts = ['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg']
-        return [
-            f for f in files 
-            if not any(f['path'].endswith(ext) for ext in config_exts)
-        ]
-    
+        config_exts = ('.json', '.yaml', '.yml', '.toml', '.ini', '.cfg')
+        return [f for f in files if not f['path'].endswith(config_exts)]
+
     @staticmethod
     def only_source_code(files: List[Dict]) -> List[Dict]:
         """Keep only source code files"""
-        source_exts = [
-            '.py', '.js', '.ts', '.java', '.cpp', '.c', '.cs', 
+        source_exts = (
+            '.py', '.js', '.ts', '.java', '.cpp', '.c', '.cs',
             '.go', '.rs', '.rb', '.php', '.swift', '.kt', '.scala'
-        ]
+        )
         return FileFilter.filter_by_extension(files, source_exts)
 
 
 class ExportUtilities:
     """Export summaries and results to different formats"""
-    
+
+    @staticmethod
+    def _resolve_analyzer(summary: 'str | SummaryAnalyzer') -> SummaryAnalyzer:
+        """Accept a path or an already-loaded analyzer"""
+        if isinstance(summary, SummaryAnalyzer):
+            return summary
+        return SummaryAnalyzer.from_path(summary)
+
     @staticmethod
-    def export_to_markdown(summary_path: str, output_path: str):
+    def export_to_markdown(summary_path: 'str | SummaryAnalyzer', output_path: str):
         """Export summary to Markdown format"""
-        analyzer = SummaryAnalyzer(summary_path)
+        analyzer = ExportUtilities._resolve_analyzer(summary_path)
         
         md_lines = []
         md_lines.append(f"# Repository Analysis: {analyzer.metadata.get('repo_url', 'Unknown')}\n")
         md_lines.append(f"**Analysis Date**: {analyzer.metadata.get('timestamp', 'Unknown')}\n")
         md_lines.append(f"**Total Files**: {analyzer.metadata.get('total_files', 0)}\n")
         
+        agg = analyzer.aggregates
         md_lines.append("\n## Language Distribution\n")
-        lang_dist = analyzer.get_language_distribution()
-        for lang, count in sorted(lang_dist.items(), key=lambda x: x[1], reverse=True):
-            md_lines.append(f"- **{lang}**: {count} files")
-        
+        md_lines.extend(
+            f"- **{lang}**: {count} files"
+            for lang, count in agg.languages.most_common()
+        )
+
         md_lines.append("\n## Top Dependencies\n")
-        top_deps = analyzer.get_top_dependencies(15)
-        for dep, count in top_deps:
-            md_lines.append(f"- `{dep}`: {count} occurrences")
+        md_lines.extend(
+            f"- `{dep}`: {count} occurrences"
+            for dep, count in agg.dependencies.most_common(15)
+        )
         
         md_lines.append("\n## File Summaries\n")
-        for summary in analyzer.summaries[:50]:  # Limit to first 50
+        for summary in islice(analyzer.summaries, 50):  # Limit to first 50
             md_lines.append(f"\n### {summary['path']}\n")
-            md_lines.append(f"**Language**: {summary.get('language', 'Unknown')}\n")
+            md_lines.append(f"**Language**: {summary['language'] or 'Unknown'}\n")
             md_lines.append(f"**Purpose**: {summary.get('purpose', 'Unknown')}\n")
             md_lines.append(f"**Summary**: {summary.get('summary', 'No summary')}\n")
             
-            if summary.get('key_concepts'):
+            if summary['key_concepts']:
                 md_lines.append(f"**Key Concepts**: {', '.join(summary['key_concepts'][:5])}\n")
         
-        md_content = "\n".join(md_lines)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(md_content)
-        
+        # writelines on a generator streams the lines out without first
+        # joining them into one giant string
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(line + "\n" for line in md_lines)
+
         print(f"✅ Markdown report exported to: {output_path}")
     
     @staticmethod
-    def export_to_csv(summary_path: str, output_path: str):
+    def export_to_csv(summary_path: 'str | SummaryAnalyzer', output_path: str):
         """Export basic summary information to CSV"""
-        analyzer = SummaryAnalyzer(summary_path)
+        analyzer = ExportUtilities._resolve_analyzer(summary_path)
         
         import csv
         
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow(['Path', 'Language', 'Size', 'Purpose', 'Key Concepts'])
-            
-            for summary in analyzer.summaries:
-                writer.writerow([
+
+            # writerows loops over the generator at C level instead of one
+            # writerow call per summary
+            writer.writerows(
+                (
                     summary['path'],
-                    summary.get('language', ''),
+                    summary['language'] or '',
                     summary['size'],
                     summary.get('purpose', ''),
-                    ', '.join(summary.get('key_concepts', [])[:3])
-                ])
-        
+                    ', '.join(summary['key_concepts'][:3])
+                )
+                for summary in analyzer.summaries
+            )
+
         print(f"✅ CSV exported to: {output_path}")
 
 
 def compare_repositories(summary_path1: str, summary_path2: str) -> Dict:
     """Compare two repositories"""
-    analyzer1 = SummaryAnalyzer(summary_path1)
-    analyzer2 = SummaryAnalyzer(summary_path2)
+    analyzer1 = SummaryAnalyzer.from_path(summary_path1)
+    analyzer2 = SummaryAnalyzer.from_path(summary_path2)
     
+    agg1 = analyzer1.aggregates
+    agg2 = analyzer2.aggregates
+
     comparison = {
         'repo1': {
             'url': analyzer1.metadata.get('repo_url'),
             'total_files': len(analyzer1.summaries),
-            'languages': analyzer1.get_language_distribution(),
-            'top_concepts': dict(analyzer1.get_top_concepts(10))
+            'languages': dict(agg1.languages),
+            'top_concepts': dict(agg1.concepts.most_common(10))
         },
         'repo2': {
             'url': analyzer2.metadata.get('repo_url'),
             'total_files': len(analyzer2.summaries),
-            'languages': analyzer2.get_language_distribution(),
-            'top_concepts': dict(analyzer2.get_top_concepts(10))
+            'languages': dict(agg2.languages),
+            'top_concepts': dict(agg2.concepts.most_common(10))
         }
     }
-    
-    # Find common concepts
-    concepts1 = set(analyzer1.get_top_concepts(50))
-    concepts2 = set(analyzer2.get_top_concepts(50))
-    comparison['common_concepts'] = list(concepts1.intersection(concepts2))
+
+    # Find common concepts. The old version intersected sets of
+    # (concept, count) tuples, which almost never matched because the
+    # counts differ between repos; compare the concept names via the
+    # cached counters' key views instead
+    comparison['common_concepts'] = sorted(agg1.concepts.keys() & agg2.concepts.keys())
     
     return comparison
 
 
-def create_question_templates(domain: str) -> List[str]:
+# Static data hoisted out of create_question_templates: building the dict
+# per call allocated ~50 strings and lists each time. Tuples inside a
+# read-only mapping keep callers from mutating shared state.
+_QUESTION_TEMPLATES = MappingProxyType({
+    'api': (
+        "How do I authenticate with this API?",
+        "What endpoints are available?",
+        "How do I handle errors in API calls?",
+        "What rate limiting is implemented?",
+        "How do I make async requests?"
+    ),
+    'web_framework': (
+        "How is routing configured?",
+        "What middleware is used?",
+        "How are templates rendered?",
+        "How is database integration handled?",
+        "What authentication methods are supported?"
+    ),
+    'library': (
+        "What are the main classes and their purposes?",
+        "How do I install and import this library?",
+        "What are some usage examples?",
+        "How is error handling implemented?",
+        "What dependencies does this library have?"
+    ),
+    'cli_tool': (
+        "What command-line options are available?",
+        "How do I configure this tool?",
+        "What are the main commands?",
+        "How do I extend this tool?",
+        "What output formats are supported?"
+    ),
+    'general': (
+        "What is the purpose of this project?",
+        "How is the project structured?",
+        "What are the main features?",
+        "How do I contribute to this project?",
+        "What testing framework is used?"
+    )
+})
+
+
+def create_question_templates(domain: str) -> tuple:
     """Generate question templates for common domains"""
-    templates = {
-        'api': [
-            "How do I authenticate with this API?",
-            "What endpoints are available?",
-            "How do I handle errors in API calls?",
-            "What rate limiting is implemented?",
-            "How do I make async requests?"
-        ],
-        'web_framework': [
-            "How is routing configured?",
-            "What middleware is used?",
-            "How are templates rendered?",
-            "How is database integration handled?",
-            "What authentication methods are supported?"
-        ],
-        'library': [
-            "What are the main classes and their purposes?",
-            "How do I install and import this library?",
-            "What are some usage examples?",
-            "How is error handling implemented?",
-            "What dependencies does this library have?"
-        ],
-        'cli_tool': [
-            "What command-line options are available?",
-            "How do I configure this tool?",
-            "What are the main commands?",
-            "How do I extend this tool?",
-            "What output formats are supported?"
-        ],
-        'general': [
-            "What is the purpose of this project?",
-            "How is the project structured?",
-            "What are the main features?",
-            "How do I contribute to this project?",
-            "What testing framework is used?"
-        ]
-    }
-    
-    return templates.get(domain, templates['general'])
+    return _QUESTION_TEMPLATES.get(domain, _QUESTION_TEMPLATES['general'])
 
 
 if __name__ == "__main__":